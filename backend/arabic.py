@@ -0,0 +1,98 @@
+import re
+import threading
+from collections import defaultdict
+
+# التشكيل وعلامات القرآن والألف الخنجرية
+_DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed]')
+_TATWEEL = '\u0640'
+_LETTERS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ئ': 'ي',
+    'ؤ': 'و',
+    'ة': 'ه',
+    # الأرقام العربية والفارسية إلى أرقام لاتينية حتى تتطابق أرقام الهويات والهواتف
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+    **{chr(0x06f0 + i): str(i) for i in range(10)},
+})
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize(text):
+    """توحيد النص العربي للبحث: الهمزات وأشكال الألف، التاء المربوطة/الهاء، الياء/الألف المقصورة،
+    مع حذف التشكيل والتطويل وعلامات الترقيم"""
+    if text is None:
+        return ''
+    text = _DIACRITICS.sub('', str(text)).replace(_TATWEEL, '').translate(_LETTERS).lower()
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+def search_text(*values):
+    """النص المخزن في عمود search_text: القيم المطبّعة مفصولة بمسافة"""
+    return ' '.join(filter(None, (normalize(v) for v in values)))
+
+
+def trigrams(text):
+    """ثلاثيات الأحرف لكل كلمة بنفس حشو pg_trgm (مسافتان قبل الكلمة ومسافة بعدها)"""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NgramIndex:
+    """فهرس ثلاثيات في الذاكرة (بديل pg_trgm لـ SQLite): قائمة مقلوبة ثلاثية ← أرقام السجلات"""
+
+    def __init__(self, documents):
+        self._texts = {}
+        self._postings = defaultdict(set)
+        for doc_id, text in documents:
+            text = text or ''
+            self._texts[doc_id] = text
+            for gram in trigrams(text):
+                self._postings[gram].add(doc_id)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def search(self, query, threshold=0.5):
+        """[(الدرجة، رقم السجل)] مرتبة تنازليًا. الدرجة نسبة ثلاثيات الاستعلام الموجودة في السجل،
+        ويضاف 1 إذا وُجد الاستعلام كاملًا كنص متصل (مثل جزء من رقم هوية)."""
+        query = normalize(query)
+        grams = trigrams(query)
+        if not grams:
+            return []
+        counts = defaultdict(int)
+        for gram in grams:
+            for doc_id in self._postings.get(gram, ()):
+                counts[doc_id] += 1
+        results = []
+        for doc_id, count in counts.items():
+            score = count / len(grams)
+            if query in self._texts[doc_id]:
+                score += 1
+            if score >= threshold:
+                results.append((round(score, 4), doc_id))
+        results.sort(key=lambda item: (-item[0], item[1]))
+        return results
+
+
+class IndexCache:
+    """فهرس لكل (جهة، جدول) يُعاد بناؤه فقط عند تغير رقم إصدار الجدول"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, version, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+        index = NgramIndex(build())
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (version, index)
+        return index
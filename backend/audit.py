@@ -0,0 +1,155 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditWriter:
+    """كاتب سجل العمليات على دفعات من خيط خلفي.
+
+    الطلبات تضع السجل في طابور محدود الحجم وتعود فورًا، والخيط الخلفي يجمع
+    حتى batch_size سجل (أو ينتظر flush_interval ثانية) ثم يستدعي flush(records)
+    مرة واحدة للدفعة كلها. الدفعة التي فشلت كتابتها (انقطاع قاعدة البيانات مثلًا) تُعاد
+    max_retries مرة بانتظار يتضاعف من retry_backoff ثانية، ولا تُسقط إلا بعدها.
+
+    سياسة الضغط الخلفي عند امتلاء الطابور (backpressure):
+      - block: انتظار block_timeout ثانية ثم الكتابة المباشرة إذا بقي ممتلئًا
+      - drop:  إسقاط السجل وزيادة عداد dropped
+      - sync:  الكتابة المباشرة في خيط الطلب
+    """
+
+    POLICIES = ('block', 'drop', 'sync')
+
+    def __init__(self, flush, max_queue=10000, batch_size=200, flush_interval=0.5,
+                 backpressure='block', block_timeout=1.0, max_retries=3, retry_backoff=0.5):
+        if backpressure not in self.POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {backpressure}")
+        self._flush = flush
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._stats = {
+            'submitted': 0, 'written': 0, 'failed': 0, 'dropped': 0, 'inline_writes': 0, 'retries': 0,
+            'batches': 0, 'enqueue_seconds': 0.0, 'flush_seconds': 0.0,
+        }
+        atexit.register(self.close)
+
+    def _count(self, **changes):
+        # العدادات تُحدّث من خيوط الطلبات ومن خيط الكاتب
+        with self._lock:
+            for name, change in changes.items():
+                self._stats[name] += change
+
+    def _ensure_started(self):
+        # بعد fork (عمال gunicorn) يحتاج كل عامل طابوره وخيطه الخاص
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def submit(self, record):
+        """إضافة سجل للطابور؛ تعيد False إذا أُسقط بسبب سياسة drop"""
+        self._ensure_started()
+        started = time.perf_counter()
+        try:
+            if self.backpressure == 'block':
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            if self.backpressure == 'drop':
+                self._count(dropped=1)
+                return False
+            self._count(inline_writes=1)
+            # محاولة واحدة: خيط الطلب لا ينتظر فترات إعادة المحاولة
+            self._write([record], retries=0)
+        self._count(submitted=1, enqueue_seconds=time.perf_counter() - started)
+        return True
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            if record is _STOP:
+                return
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stop = True
+                    break
+                batch.append(record)
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch, retries=None):
+        retries = self.max_retries if retries is None else retries
+        for attempt in range(retries + 1):
+            started = time.perf_counter()
+            try:
+                self._flush(batch)
+            except Exception:
+                if attempt < retries:
+                    logger.warning("Failed to write %d audit records, retrying", len(batch), exc_info=True)
+                    self._count(retries=1)
+                    time.sleep(self.retry_backoff * 2 ** attempt)
+                    continue
+                self._count(failed=len(batch))
+                logger.exception("Dropping %d audit records after %d attempts: %r", len(batch), attempt + 1, batch)
+                return
+            self._count(written=len(batch), batches=1, flush_seconds=time.perf_counter() - started)
+            return
+
+    def close(self, timeout=5.0):
+        """تفريغ ما تبقى في الطابور قبل إيقاف العملية"""
+        if self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._pid = None
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        submitted, written = stats.pop('submitted'), stats['written']
+        enqueue_seconds, flush_seconds = stats.pop('enqueue_seconds'), stats.pop('flush_seconds')
+        stats.update({
+            'submitted': submitted,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'backpressure': self.backpressure,
+            # زمن الطلب الفعلي مقابل زمن الكتابة الذي كان سيدفعه الطلب لو كتب مباشرة
+            'avg_enqueue_ms': round(enqueue_seconds / submitted * 1000, 4) if submitted else None,
+            'avg_write_ms_per_batch': round(flush_seconds / stats['batches'] * 1000, 4) if stats['batches'] else None,
+            'avg_write_ms_per_record': round(flush_seconds / written * 1000, 4) if written else None,
+        })
+        return stats
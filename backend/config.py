@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# بدون DATABASE_URL يعمل التطبيق محليًا على SQLite داخل مجلد instance. الملف غير متتبع في git:
+# قواعد instance المتتبعة (furqan.db وغيرها) بمخطط قديم بلا tenant_id ولا تصلح للتشغيل
+SQLITE_FALLBACK = 'sqlite:///local.db'
+# متغيرات تضعها منصات الاستضافة (Render / Heroku)؛ وجودها بلا DATABASE_URL خطأ في النشر
+HOSTED_ENV_MARKERS = ('RENDER', 'DYNO')
+SLOW_CHECKOUT_SECONDS = 0.1
+
+
+def env_bool(value, default=False):
+    if value is None or value == '':
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def is_hosted(environ):
+    return environ.get('APP_ENV') == 'production' or any(environ.get(name) for name in HOSTED_ENV_MARKERS)
+
+
+def normalize_database_url(url):
+    # Render/Heroku يعطيان postgres:// وSQLAlchemy 2 لا يقبل إلا postgresql://، والمشغّل
+    # الافتراضي يختلف بين الإصدارات فنثبته على psycopg2 المذكور في requirements.txt
+    if not url:
+        return url
+    for scheme in ('postgres://', 'postgresql://'):
+        if url.startswith(scheme):
+            return 'postgresql+psycopg2://' + url[len(scheme):]
+    return url
+
+
+class PoolStats:
+    """زمن انتظار الحصول على اتصال من المجمع لكل قاعدة (primary / replica)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, label, seconds, timed_out=False):
+        with self._lock:
+            stats = self._stats.setdefault(label, {
+                'checkouts': 0, 'timeouts': 0, 'slow_checkouts': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0,
+            })
+            if timed_out:
+                stats['timeouts'] += 1
+                return
+            stats['checkouts'] += 1
+            stats['wait_seconds'] += seconds
+            stats['max_wait_seconds'] = max(stats['max_wait_seconds'], seconds)
+            if seconds >= SLOW_CHECKOUT_SECONDS:
+                stats['slow_checkouts'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for label, stats in self._stats.items():
+                checkouts = stats['checkouts']
+                result[label] = {
+                    'checkouts': checkouts,
+                    'timeouts': stats['timeouts'],
+                    'slow_checkouts': stats['slow_checkouts'],
+                    'avg_wait_ms': round(stats['wait_seconds'] / checkouts * 1000, 3) if checkouts else None,
+                    'max_wait_ms': round(stats['max_wait_seconds'] * 1000, 3),
+                }
+            return result
+
+
+pool_stats = PoolStats()
+
+
+def timed_pool(label):
+    """QueuePool يقيس زمن انتظار كل طلب اتصال؛ صنف لكل قاعدة لأن pool.recreate() لا يمرر معاملات إضافية"""
+
+    class TimedQueuePool(QueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                pool_stats.record(label, 0, timed_out=True)
+                raise
+            pool_stats.record(label, time.perf_counter() - started)
+            return connection
+
+    TimedQueuePool.__name__ = f'TimedQueuePool_{label}'
+    return TimedQueuePool
+
+
+def engine_options(url, environ, label):
+    """خيارات create_engine: المجمع ومهلة الاستعلامات لـ Postgres فقط، وSQLite يبقى على الإعداد الافتراضي"""
+    if url.startswith('sqlite'):
+        return {}
+    options = {
+        'poolclass': timed_pool(label),
+        'pool_size': int(environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(environ.get('DB_POOL_TIMEOUT', 10)),
+        # المزود يغلق الاتصالات الخاملة، فنعيد تدويرها قبل ذلك ونفحصها قبل الاستخدام
+        'pool_recycle': int(environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': env_bool(environ.get('DB_POOL_PRE_PING'), True),
+    }
+    statement_timeout = int(environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+    if statement_timeout and url.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+
+def database_config(environ):
+    """إعدادات Flask-SQLAlchemy من متغيرات البيئة:
+
+    DATABASE_URL (مطلوب إذا كان APP_ENV=production أو على Render/Heroku), DATABASE_REPLICA_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS
+    """
+    url = normalize_database_url(environ.get('DATABASE_URL'))
+    if not url:
+        if is_hosted(environ):
+            # SQLite على قرص المنصة المؤقت يضيع البيانات مع كل نشر، فلا نبدأ أصلًا
+            raise RuntimeError('DATABASE_URL غير معرّف في بيئة الإنتاج')
+        logger.warning("DATABASE_URL غير معرّف: التشغيل على SQLite المحلي (%s)", SQLITE_FALLBACK)
+        url = SQLITE_FALLBACK
+    config = {
+        'SQLALCHEMY_DATABASE_URI': url,
+        'SQLALCHEMY_ENGINE_OPTIONS': engine_options(url, environ, 'primary'),
+        'SQLALCHEMY_BINDS': {},
+    }
+    replica_url = normalize_database_url(environ.get('DATABASE_REPLICA_URL'))
+    if replica_url:
+        config['SQLALCHEMY_BINDS']['replica'] = {
+            'url': replica_url, **engine_options(replica_url, environ, 'replica'),
+        }
+    return config
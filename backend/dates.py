@@ -0,0 +1,63 @@
+import re
+from datetime import date, datetime, timedelta
+
+from arabic import normalize
+
+# أرقام Excel التسلسلية تبدأ من 1899-12-30، ونقبل منها ما يقع بين 1950 و2100 فقط
+EXCEL_EPOCH = date(1899, 12, 30)
+EXCEL_SERIAL_MIN, EXCEL_SERIAL_MAX = 18264, 73051
+MIN_YEAR, MAX_YEAR = 1900, 2100
+
+_SERIAL = re.compile(r'\d+(\.\d+)?')
+_NUMBERS = re.compile(r'\d+')
+
+
+def from_excel_serial(serial):
+    if not EXCEL_SERIAL_MIN <= serial <= EXCEL_SERIAL_MAX:
+        return None
+    return EXCEL_EPOCH + timedelta(days=int(serial))
+
+
+def parse_date(value):
+    """تحويل تاريخ من الواجهة أو ملف Excel أو البيانات القديمة إلى date، وNone إذا لم يُفهم.
+
+    يقبل: date/datetime، رقم Excel التسلسلي (45292 أو '45292.0')، السنة أولًا بأي فاصل ومع وقت
+    أو بدونه ('2024-01-01 00:00:00'، '2024/1/1')، واليوم أولًا ('01/02/2024')، وإذا كان الرقم
+    الثاني أكبر من 12 فالصيغة أمريكية (الشهر أولًا). الأرقام العربية تُحوّل قبل التحليل.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, (int, float)):
+        return from_excel_serial(value)
+
+    text = normalize(value)
+    if not text:
+        return None
+    raw = str(value).strip()
+    if _SERIAL.fullmatch(raw):
+        return from_excel_serial(float(raw))
+
+    parts = _NUMBERS.findall(text)
+    if len(parts) < 3:
+        return None
+    first, second, third = parts[:3]
+    if len(first) == 4:
+        year, month, day = int(first), int(second), int(third)
+    elif len(third) in (2, 4):
+        day, month, year = int(first), int(second), int(third)
+        if len(third) == 2:
+            year += 2000
+        if month > 12 >= day:
+            day, month = month, day
+    else:
+        return None
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
@@ -0,0 +1,138 @@
+"""كشف الأسر المكررة بأسماء مكتوبة بطرق مختلفة أو هويات مبدلة بين الزوجين أو رقم هاتف جديد.
+
+بدل مقارنة كل زوج من السجلات (n²) تُقسم السجلات إلى كتل (blocking) بمفاتيح رخيصة:
+بداية رقم الهوية، آخر أرقام الهاتف، وكلمات اسم الزوج (الأول والأب والعائلة) بعد حذف حروف المد.
+لا يُقارن إلا السجلات التي تشترك في كتلة، والكتل الأكبر من max_block تُتجاهل لأنها
+مفاتيح شائعة (اسم منتشر مثلًا) لا تميّز شيئًا، فيبقى العمل قريبًا من الخطي.
+"""
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from arabic import normalize
+
+_DIGITS = re.compile(r'\D+')
+# حروف المد والهاء الأخيرة تختلف كثيرًا بين طرق كتابة نفس الاسم
+_SKELETON = str.maketrans('', '', 'اوي')
+_ABD = re.compile(r'\bعبد (?=\S)')
+
+WEIGHTS = {'id': 0.5, 'name': 0.35, 'phone': 0.15}
+
+
+def digits(value):
+    return _DIGITS.sub('', str(value)) if value else ''
+
+
+def name_tokens(value):
+    # "عبد الله" و"عبدالله" اسم واحد
+    return _ABD.sub('عبد', normalize(value)).split()
+
+
+def skeleton(token):
+    return token.rstrip('ه').translate(_SKELETON) or token
+
+
+def similarity(a, b):
+    if not a or not b:
+        return None
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def id_similarity(a, b):
+    # الهويات بنفس الطول تختلف عادة في خانة أُدخلت خطأ، والمقارنة خانة بخانة أسرع بكثير من SequenceMatcher
+    if len(a) == len(b):
+        return 1 - sum(x != y for x, y in zip(a, b)) / len(a)
+    return similarity(a, b)
+
+
+class Record:
+    __slots__ = ('id', 'ids', 'husband_ids', 'wife_ids', 'phone', 'husband', 'wife')
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.husband_ids = digits(row.get('husband_id_number'))
+        self.wife_ids = digits(row.get('wife_id_number'))
+        self.ids = [i for i in (self.husband_ids, self.wife_ids) if i]
+        self.phone = digits(row.get('phone_number'))[-7:]
+        self.husband = ' '.join(name_tokens(row.get('husband_name')))
+        self.wife = ' '.join(name_tokens(row.get('wife_name')))
+
+    def block_keys(self, id_prefix):
+        keys = {('id', i[:id_prefix]) for i in self.ids if len(i) >= id_prefix}
+        if len(self.phone) == 7:
+            keys.add(('phone', self.phone))
+        # الاسم الأول واسم الأب والعائلة للزوج؛ اسم الزوجة وحده (اسمان غالبًا) لا يميز بما يكفي للتقسيم
+        tokens = [skeleton(token) for token in self.husband.split()]
+        if len(tokens) >= 3:
+            keys.add(('name', tokens[0], tokens[1], tokens[-1]))
+        elif len(tokens) == 2:
+            keys.add(('name', tokens[0], tokens[1]))
+        return keys
+
+
+def score_pair(a, b):
+    """درجة بين 0 و1 مع أسباب التطابق؛ الأوزان تُوزع على الحقول المتوفرة في السجلين فقط"""
+    reasons, scores = [], {}
+
+    shared = set(a.ids) & set(b.ids)
+    if shared:
+        scores['id'] = 1.0
+        swapped = (a.husband_ids and a.husband_ids in (b.wife_ids,)) or (a.wife_ids and a.wife_ids in (b.husband_ids,))
+        reasons.append('swapped_ids' if swapped and not (a.husband_ids == b.husband_ids and a.husband_ids) else 'same_id')
+    elif a.ids and b.ids:
+        best = max(id_similarity(x, y) for x in a.ids for y in b.ids)
+        scores['id'] = best if best >= 0.85 else 0.0
+        if scores['id']:
+            reasons.append('similar_id')
+
+    names = [s for s in (similarity(a.husband, b.husband), similarity(a.wife, b.wife)) if s is not None]
+    if names:
+        scores['name'] = sum(names) / len(names)
+        if scores['name'] >= 0.8:
+            reasons.append('similar_names')
+
+    if a.phone and b.phone:
+        scores['phone'] = 1.0 if a.phone == b.phone else 0.0
+        if scores['phone']:
+            reasons.append('same_phone')
+
+    total_weight = sum(WEIGHTS[field] for field in scores)
+    if not total_weight:
+        return 0.0, reasons
+    return sum(WEIGHTS[field] * value for field, value in scores.items()) / total_weight, reasons
+
+
+def find_duplicates(rows, threshold=0.75, id_prefix=7, max_block=50):
+    """rows: قواميس بأعمدة المستفيد. تعيد (المرشحون [(id1, id2, الدرجة، الأسباب)]، إحصائيات)"""
+    records = [Record(row) for row in rows]
+    blocks = defaultdict(list)
+    for index, record in enumerate(records):
+        for key in record.block_keys(id_prefix):
+            blocks[key].append(index)
+
+    pairs, skipped_blocks = set(), 0
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) > max_block:
+            skipped_blocks += 1
+            continue
+        pairs.update(combinations(members, 2))
+
+    candidates = []
+    for i, j in pairs:
+        score, reasons = score_pair(records[i], records[j])
+        if score >= threshold:
+            low, high = sorted((records[i].id, records[j].id))
+            candidates.append((low, high, round(score, 4), reasons))
+    candidates.sort(key=lambda c: (-c[2], c[0], c[1]))
+    return candidates, {
+        'residents': len(records),
+        'blocks': len(blocks),
+        'skipped_blocks': skipped_blocks,
+        'pairs_compared': len(pairs),
+        'candidates': len(candidates),
+    }
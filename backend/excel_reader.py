@@ -0,0 +1,151 @@
+import codecs
+import csv
+import io
+import os
+import zipfile
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from arabic import normalize
+
+XLSX_MAGIC = b'PK\x03\x04'
+OLE_MAGIC = b'\xd0\xcf\x11\xe0'  # xls القديم
+ENCODING_SAMPLE = 64 * 1024
+
+
+class SheetError(ValueError):
+    """الملف غير مقروء أو صيغته غير مدعومة"""
+
+
+class MissingColumns(SheetError):
+    def __init__(self, missing):
+        self.missing = list(missing)
+        super().__init__(', '.join(self.missing))
+
+
+def cell_text(value):
+    """قيمة الخلية نصًا كما يعطيها pd.read_excel(dtype=str): 400123456.0 ← '400123456'"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _open_source(file):
+    """(اسم الملف، كائن ثنائي قابل للـ seek، هل نغلقه نحن) من مسار أو FileStorage أو ملف مفتوح"""
+    if isinstance(file, (str, os.PathLike)):
+        return os.fspath(file), open(file, 'rb'), True
+    return getattr(file, 'filename', None) or getattr(file, 'name', None) or '', getattr(file, 'stream', file), False
+
+
+def _csv_encoding(stream):
+    """UTF-8 (مع BOM أو بدونه) وإلا cp1256، وهي ترميز CSV الذي يحفظه Excel على ويندوز العربي"""
+    position = stream.tell()
+    sample = stream.read(ENCODING_SAMPLE)
+    stream.seek(position)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp1256'
+
+
+class SheetReader:
+    """قراءة أول ورقة من ملف xlsx (openpyxl بوضع read_only) أو CSV صفًا صفًا بذاكرة ثابتة.
+
+    الترويسة تُقرأ وتُتحقق أولًا: أسماؤها تُطابق بعد توحيد الكتابة (arabic.normalize) مع الحقول
+    أو مع aliases (الاسم في الملف ← الحقل)، والأعمدة غير المعروفة تُهمل. chunks() تعطي DataFrame
+    نصيًا لكل chunk_size صف، فهرسه رقم الصف في الملف ناقص 2 كما في pd.read_excel (يبقى row_report صحيحًا).
+    """
+
+    def __init__(self, file, fields, required=(), aliases=None, chunk_size=5000):
+        self.chunk_size = chunk_size
+        self.rows_read = 0
+        self.total = None
+        self._workbook = None
+        self._text = None
+        name, self._stream, self._owned = _open_source(file)
+        try:
+            header = self._open(name)
+            self._map_header(header, list(fields), required, aliases or {})
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self, name):
+        head = self._stream.read(4)
+        self._stream.seek(0)
+        extension = os.path.splitext(name)[1].lower()
+        if head == XLSX_MAGIC:
+            try:
+                self._workbook = load_workbook(self._stream, read_only=True, data_only=True)
+            except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+                raise SheetError(f'ملف xlsx غير صالح: {e}')
+            sheet = self._workbook.worksheets[0]
+            # البعد المسجل في الملف (قد لا يوجد) يكفي لتقدير نسبة التقدم
+            if sheet.max_row:
+                self.total = max(sheet.max_row - 1, 0)
+            self._rows = sheet.iter_rows(values_only=True)
+        elif head == OLE_MAGIC or extension in ('.xls', '.xlsx', '.xlsm'):
+            raise SheetError('صيغة الملف غير مدعومة، احفظه بصيغة xlsx أو csv')
+        else:
+            self._text = io.TextIOWrapper(self._stream, encoding=_csv_encoding(self._stream), newline='')
+            self._rows = csv.reader(self._text)
+        try:
+            return next(self._rows, None) or ()
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise SheetError(str(e))
+
+    def _map_header(self, header, fields, required, aliases):
+        lookup = {normalize(field): field for field in fields}
+        lookup.update({normalize(alias): field for alias, field in aliases.items()})
+        positions = {}
+        for position, title in enumerate(header):
+            field = lookup.get(normalize(cell_text(title)))
+            if field and field not in positions:
+                positions[field] = position
+        missing = [field for field in required if field not in positions]
+        if missing or not positions:
+            raise MissingColumns(missing or fields)
+        self.columns = [field for field in fields if field in positions]
+        self._positions = [positions[field] for field in self.columns]
+
+    def chunks(self):
+        rows, index = [], []
+        try:
+            for number, values in enumerate(self._rows, start=2):
+                record = [cell_text(values[p]) if p < len(values) else None for p in self._positions]
+                self.rows_read += 1
+                # الصفوف الفارغة (غالبًا تنسيق بلا بيانات في آخر الورقة) لا تُعد صفوفًا
+                if not any(value and value.strip() for value in record):
+                    continue
+                rows.append(record)
+                index.append(number - 2)
+                if len(rows) >= self.chunk_size:
+                    yield self._frame(rows, index)
+                    rows, index = [], []
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise SheetError(str(e))
+        if rows:
+            yield self._frame(rows, index)
+
+    def _frame(self, rows, index):
+        return pd.DataFrame(rows, columns=self.columns, index=index, dtype=object)
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.close()
+        if self._text is not None:
+            # لا نغلق ملف الطلب نفسه مع الغلاف النصي
+            self._text.detach()
+        if self._owned:
+            self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
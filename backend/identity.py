@@ -0,0 +1,83 @@
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+
+class Identity(dict):
+    """هوية المستخدم للطلب الحالي: قاموس الـ claims نفسه (فيبقى request.user['tenant_id'] يعمل)
+    مع خصائص للحقول المستخدمة كثيرًا."""
+
+    @property
+    def user_id(self):
+        return self['user_id']
+
+    @property
+    def tenant_id(self):
+        return self['tenant_id']
+
+    @property
+    def token_version(self):
+        return self.get('tv', 0)
+
+
+class TokenCache:
+    """LRU محدود للتوكنات التي تم التحقق من توقيعها، مفتاحه توقيع الـ JWT.
+
+    كل عنصر يحفظ التوكن كاملًا (يُقارن عند الاسترجاع)، ووقت انتهائه، ووقت آخر
+    تحقق من رقم إصدار التوكن في قاعدة البيانات حتى يُعاد التحقق كل revalidate_after ثانية.
+    """
+
+    def __init__(self, max_size=10000, revalidate_after=30):
+        self.max_size = max_size
+        self.revalidate_after = revalidate_after
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'revalidations': 0}
+
+    @staticmethod
+    def key(token):
+        return token.rsplit('.', 1)[-1]
+
+    def get(self, token):
+        """تعيد (الهوية، هل تحتاج إعادة تحقق) أو (None, False)"""
+        key = self.key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not hmac.compare_digest(entry[0], token):
+                self._stats['misses'] += 1
+                return None, False
+            _, identity, expires_at, checked_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._stats['misses'] += 1
+                return None, False
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            stale = now - checked_at >= self.revalidate_after
+            if stale:
+                self._stats['revalidations'] += 1
+            return identity, stale
+
+    def put(self, token, identity, expires_at):
+        with self._lock:
+            self._entries[self.key(token)] = (token, identity, expires_at, time.time())
+            self._entries.move_to_end(self.key(token))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def discard(self, token):
+        with self._lock:
+            self._entries.pop(self.key(token), None)
+
+    def revoke_user(self, user_id):
+        """حذف كل توكنات المستخدم من هذا العامل فورًا (العمال الآخرون يكتشفونها عند إعادة التحقق)"""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[1].user_id == user_id]:
+                del self._entries[key]
+
+    def metrics(self):
+        with self._lock:
+            return dict(self._stats, size=len(self._entries), max_size=self.max_size)
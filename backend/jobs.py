@@ -0,0 +1,151 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed', 'cancelled')
+FINISHED_STATUSES = ('succeeded', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """طلب المستخدم إلغاء المهمة؛ تُرفع داخل المهمة عند أول تحديث للتقدم بعد الطلب"""
+
+
+class JobMonitor:
+    """خيط داخل عملية المهمة يكتب التقدم ونبض الحياة كل interval ثانية ويقرأ طلب الإلغاء.
+
+    المهمة نفسها تحدّث التقدم في الذاكرة فقط (monitor(done, total, message))، فلا تنتظر قاعدة
+    البيانات ولا تتعارض كتابة التقدم مع معاملة المهمة المفتوحة. report(done, total, message)
+    يكتب الحالة على اتصال مستقل ويعيد True إذا طُلب الإلغاء.
+    """
+
+    def __init__(self, report, interval=1.0):
+        self._report = report
+        self.interval = interval
+        self._state = (0, None, None)
+        self._cancelled = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='job-monitor', daemon=True)
+
+    def __call__(self, done, total=None, message=None):
+        self._state = (done, total, message)
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+    def _flush(self):
+        try:
+            if self._report(*self._state):
+                self._cancelled.set()
+        except Exception:
+            # SQLite مقفل بمعاملة المهمة مثلًا؛ المحاولة التالية بعد interval
+            logger.debug("تعذر تحديث تقدم المهمة", exc_info=True)
+
+    def _run(self):
+        self._flush()
+        while not self._stop.wait(self.interval):
+            self._flush()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._stop.set()
+        self._thread.join()
+        if exc_type is None:
+            # التقدم النهائي (المعاملة انتهت فلا تعارض مع كتابته)
+            self._flush()
+
+
+class WorkerPool:
+    """عامل المهام: يحجز المهام المنتظرة من قاعدة البيانات ويشغل كل مهمة في عملية منفصلة.
+
+    claim() يعيد رقم مهمة محجوزة أو None، وexecute(job_id) دالة على مستوى الوحدة تُنفذ داخل
+    العملية الفرعية. العمليات تبدأ بـ spawn لأن التطبيق يحمل خيوطًا واتصالات لا تصلح للنسخ بـ fork.
+    housekeeping() تُستدعى كل housekeeping_interval ثانية (المهام العالقة والنتائج القديمة).
+
+    إذا ماتت عملية فرعية فجأة (نفاد الذاكرة مثلًا) يتعطل المجمع كله وتفشل كل مهامه الجارية
+    بـ BrokenProcessPool: يُنشأ مجمع جديد، وon_crash(job_id) يسجل فشل كل مهمة منها فورًا بدل
+    انتظار انتهاء نبضها. مهمة محجوزة لم تبدأ بعد تُرسل مرة واحدة إلى المجمع الجديد.
+    """
+
+    def __init__(self, claim, execute, processes=2, poll_interval=1.0, housekeeping=None, housekeeping_interval=60,
+                 on_crash=None):
+        self.claim = claim
+        self.execute = execute
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.housekeeping = housekeeping
+        self.housekeeping_interval = housekeeping_interval
+        self.on_crash = on_crash
+        self._stop = threading.Event()
+        self._executor = None
+
+    def stop(self):
+        self._stop.set()
+
+    def _restart(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                             mp_context=multiprocessing.get_context('spawn'))
+
+    def _submit(self, running, job_id):
+        try:
+            future = self._executor.submit(self.execute, job_id)
+        except BrokenProcessPool:
+            logger.error("مجمع العمليات معطل، يُعاد إنشاؤه قبل تشغيل المهمة %s", job_id)
+            self._restart()
+            future = self._executor.submit(self.execute, job_id)
+        running[future] = (job_id, self._executor)
+
+    def _crashed(self, job_id):
+        if self.on_crash is None:
+            return
+        try:
+            self.on_crash(job_id)
+        except Exception:
+            # expire_jobs يلتقط المهمة لاحقًا عند انتهاء نبضها
+            logger.exception("تعذر تسجيل فشل المهمة %s", job_id)
+
+    def _reap(self, running):
+        for future in [f for f in running if f.done()]:
+            job_id, executor = running.pop(future)
+            error = future.exception()
+            if isinstance(error, BrokenProcessPool):
+                logger.error("توقفت عملية المهمة %s فجأة", job_id)
+                self._crashed(job_id)
+                if executor is self._executor:
+                    self._restart()
+            elif error is not None:
+                logger.error("فشلت عملية المهمة", exc_info=error)
+
+    def run(self):
+        last_housekeeping = 0.0
+        running = {}  # future -> (رقم المهمة، المجمع الذي يشغلها)
+        self._restart()
+        try:
+            while not self._stop.is_set():
+                if self.housekeeping and time.monotonic() - last_housekeeping >= self.housekeeping_interval:
+                    last_housekeeping = time.monotonic()
+                    try:
+                        self.housekeeping()
+                    except Exception:
+                        # خطأ في التنظيف لا يوقف العامل؛ المحاولة التالية بعد housekeeping_interval
+                        logger.exception("فشل تنظيف المهام")
+                self._reap(running)
+                if len(running) < self.processes:
+                    job_id = self.claim()
+                    if job_id is not None:
+                        self._submit(running, job_id)
+                        continue
+                if running:
+                    wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                else:
+                    self._stop.wait(self.poll_interval)
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
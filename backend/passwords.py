@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HasherBusy(Exception):
+    """كل خانات التحقق مشغولة؛ الطلب يُرفض فورًا بدل أن ينتظر في الطابور"""
+
+
+class PasswordHasher:
+    """تجزئة كلمات المرور والتحقق منها في مجموعة خيوط محدودة.
+
+    scrypt/pbkdf2 في hashlib تحرر الـ GIL، فيبقى خيط الطلب (gthread) ينتظر النتيجة بينما
+    تخدم بقية الخيوط المسارات الأخرى. max_pending يحدد عدد العمليات المسموح بها في نفس الوقت
+    (قيد التنفيذ أو في الانتظار)، وما زاد عنه يرفع HasherBusy.
+    """
+
+    def __init__(self, method, workers=2, max_pending=8, timeout=10.0):
+        self.method = method
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # الصيغة المخزنة فعليًا للطريقة الحالية (مثلًا scrypt ← scrypt:32768:8:1)
+        self.prefix = generate_password_hash('', method=method).split('$', 1)[0]
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # الخانة تُحرر عند انتهاء العملية فعلًا، لا عند انتهاء مهلة الانتظار، فلا تتراكم
+        # عمليات متأخرة في الطابور فوق max_pending
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HasherBusy()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """التجزئة المخزنة بطريقة أو معاملات غير الحالية"""
+        return pwhash.split('$', 1)[0] != self.prefix
+
+
+class AttemptLimiter:
+    """حد لمحاولات الدخول الفاشلة لكل اسم مستخدم داخل نافذة زمنية (في ذاكرة العامل)"""
+
+    def __init__(self, max_failures=5, window=300, max_entries=10000):
+        self.max_failures = max_failures
+        self.window = window
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._failures = {}  # username -> [أوقات المحاولات الفاشلة]
+
+    def _recent(self, username, now):
+        attempts = [t for t in self._failures.get(username, ()) if now - t < self.window]
+        if attempts:
+            self._failures[username] = attempts
+        else:
+            self._failures.pop(username, None)
+        return attempts
+
+    def retry_after(self, username):
+        """عدد الثواني المتبقية إذا كان المستخدم محظورًا مؤقتًا، وإلا 0"""
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._recent(username, now)
+            if len(attempts) < self.max_failures:
+                return 0
+            return int(self.window - (now - attempts[0])) + 1
+
+    def failed(self, username):
+        now = time.monotonic()
+        with self._lock:
+            if username not in self._failures and len(self._failures) >= self.max_entries:
+                # تنظيف النوافذ المنتهية قبل إضافة اسم جديد حتى لا يكبر القاموس بلا حد
+                for name in list(self._failures):
+                    self._recent(name, now)
+                if len(self._failures) >= self.max_entries:
+                    self._failures.pop(next(iter(self._failures)))
+            self._failures.setdefault(username, []).append(now)
+
+    def reset(self, username):
+        with self._lock:
+            self._failures.pop(username, None)
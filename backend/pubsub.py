@@ -0,0 +1,102 @@
+import json
+import queue
+import threading
+from collections import defaultdict
+
+
+class Subscription:
+    def __init__(self, broker, channel, max_pending):
+        self._broker = broker
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=max_pending)
+
+    def get(self, timeout=None):
+        """الرسالة التالية أو None عند انتهاء المهلة"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LocalBroker:
+    """نشر/اشتراك داخل نفس العملية: يكفي لعامل واحد وللاختبارات.
+    المشترك البطيء تُسقط رسائله الزائدة، ويستكملها من قاعدة البيانات."""
+
+    def __init__(self, max_pending=1000):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                pass
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.max_pending)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+class RedisSubscription:
+    def __init__(self, pubsub, channel):
+        self._pubsub = pubsub
+        self.channel = channel
+        self._pubsub.subscribe(channel)
+
+    def get(self, timeout=None):
+        message = self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout or 0)
+        return json.loads(message['data']) if message else None
+
+    def close(self):
+        self._pubsub.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RedisBroker:
+    """نشر/اشتراك عبر Redis حتى تصل الرسائل لكل عمال gunicorn (يتطلب حزمة redis)"""
+
+    def __init__(self, url):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self._redis.publish(channel, json.dumps(message, ensure_ascii=False, default=str))
+
+    def subscribe(self, channel):
+        return RedisSubscription(self._redis.pubsub(), channel)
+
+
+def create_broker(url=None):
+    if not url or url == 'local':
+        return LocalBroker()
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisBroker(url)
+    raise ValueError(f"Unsupported pub/sub backend: {url}")
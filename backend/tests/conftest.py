@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+
+@pytest.fixture(scope='session')
+def flask_app(tmp_path_factory):
+    """التطبيق على قاعدة SQLite مؤقتة؛ app.py ينشئ الجداول عند الاستيراد فتُضبط البيئة قبله.
+    الـ replica هي نفس الملف، فيُختبر التوجيه دون نسخ فعلي."""
+    url = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+    os.environ['DATABASE_URL'] = url
+    os.environ['DATABASE_REPLICA_URL'] = url
+    os.environ['AUDIT_MODE'] = 'sync'
+    import app as app_module
+    return app_module
+
+
+@pytest.fixture
+def tenant(flask_app):
+    """جهة جديدة بمستخدم مدير لكل اختبار، وترويسة Authorization بتوكنه"""
+    db = flask_app.db
+    with flask_app.app.app_context():
+        count = db.session.query(flask_app.Tenant).count()
+        tenant = flask_app.Tenant(name=f'جهة {count}', slug=f'tenant-{count}')
+        db.session.add(tenant)
+        db.session.flush()
+        user = flask_app.User(username=f'admin-{count}', role='admin', tenant_id=tenant.id)
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+        token = flask_app.generate_token(user)
+        return {'id': tenant.id, 'user_id': user.id, 'username': user.username,
+                'headers': {'Authorization': f'Bearer {token}'}}
+
+
+@pytest.fixture
+def client(flask_app):
+    return flask_app.app.test_client()
+
+
+@pytest.fixture
+def add_resident(flask_app):
+    """إضافة مستفيد مباشرة في قاعدة البيانات وتعيد رقمه"""
+    def add(tenant_id, **values):
+        values.setdefault('husband_name', 'محمد')
+        values.setdefault('husband_id_number', '400111111')
+        with flask_app.app.app_context():
+            resident = flask_app.Resident(tenant_id=tenant_id, **values)
+            flask_app.db.session.add(resident)
+            flask_app.db.session.commit()
+            return resident.id
+    return add
@@ -0,0 +1,42 @@
+from datetime import date
+
+
+def test_stats_include_aids_written_before_first_stats_request(flask_app, client, tenant, add_resident):
+    resident_id = add_resident(tenant['id'], neighborhood='الشمال')
+    with flask_app.app.app_context():
+        # مساعدة قديمة سبقت وجود العدادات
+        flask_app.db.session.add(flask_app.Aid(resident_id=resident_id, aid_type='غذاء',
+                                               date=date(2024, 1, 1), tenant_id=tenant['id']))
+        flask_app.db.session.commit()
+
+    response = client.post('/api/aids', json={'resident_id': resident_id, 'aid_type': 'غذاء', 'date': '2024-01-02'},
+                           headers=tenant['headers'])
+    assert response.status_code == 201
+    assert client.get('/api/aids/stats', headers=tenant['headers']).json['total_aids'] == 2
+
+    client.post('/api/aids', json={'resident_id': resident_id, 'aid_type': 'نقد', 'date': '2024-01-03'},
+                headers=tenant['headers'])
+    stats = client.get('/api/aids/stats', headers=tenant['headers']).json
+    assert stats['total_aids'] == 3
+    assert stats['monthly_counts'] == [{'month': '2024-01', 'count': 3}]
+
+
+def test_duplicate_aid_returns_400(client, tenant, add_resident):
+    resident_id = add_resident(tenant['id'], neighborhood='الشمال')
+    aid = {'resident_id': resident_id, 'aid_type': 'غذاء', 'date': '2024-05-01'}
+    assert client.post('/api/aids', json=aid, headers=tenant['headers']).status_code == 201
+    assert client.post('/api/aids', json=aid, headers=tenant['headers']).status_code == 400
+
+    other = client.post('/api/aids', json=dict(aid, date='2024-05-02'), headers=tenant['headers']).json
+    response = client.put(f"/api/aids/{other['id']}", json={'date': '2024-05-01'}, headers=tenant['headers'])
+    assert response.status_code == 400
+
+
+def test_date_range_filters(client, tenant, add_resident):
+    resident_id = add_resident(tenant['id'], neighborhood='الشمال')
+    for day in ('2024-01-10', '2024-02-10', '2024-03-10'):
+        client.post('/api/aids', json={'resident_id': resident_id, 'aid_type': 'غذاء', 'date': day},
+                    headers=tenant['headers'])
+    response = client.get('/api/aids?date_from=2024-02-01&date_to=10/02/2024', headers=tenant['headers'])
+    assert [aid['date'] for aid in response.json] == ['2024-02-10']
+    assert client.get('/api/aids?date_from=soon', headers=tenant['headers']).status_code == 400
@@ -0,0 +1,38 @@
+from arabic import IndexCache, NgramIndex, normalize, search_text
+
+
+def test_normalize_unifies_spelling_variants():
+    assert normalize('أحمد') == normalize('احمد') == 'احمد'
+    assert normalize('فاطمة') == normalize('فاطمه')
+    assert normalize('مصطفى') == normalize('مصطفي')
+    assert normalize('مُحَمَّـــد') == 'محمد'
+    assert normalize('٤٠٠١٢٣') == '400123'
+    assert normalize('  عبد-الله ،  ') == 'عبد الله'
+    assert normalize(None) == ''
+
+
+def test_search_text_skips_empty_values():
+    assert search_text('أحمد', None, '', '٠٥٩') == 'احمد 059'
+
+
+def test_ngram_index_ranks_exact_and_partial_matches():
+    index = NgramIndex([(1, search_text('محمد احمد')), (2, search_text('محمود سعيد')), (3, '400123456')])
+    results = index.search('أحمد')
+    assert results[0][1] == 1
+    assert 2 not in [doc_id for _, doc_id in results]
+    # جزء من رقم الهوية: ثلاثيتان من خمس (0.4) و+1 لأنه نص متصل في السجل
+    assert index.search('0123')[0] == (1.4, 3)
+    assert index.search('') == []
+
+
+def test_index_cache_rebuilds_only_on_new_version():
+    cache, builds = IndexCache(), []
+
+    def build():
+        builds.append(1)
+        return [(1, 'احمد')]
+
+    first = cache.get(('t', 'resident'), 1, build)
+    assert cache.get(('t', 'resident'), 1, build) is first
+    assert cache.get(('t', 'resident'), 2, build) is not first
+    assert len(builds) == 2
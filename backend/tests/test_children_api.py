@@ -0,0 +1,13 @@
+CHILD = {'name': 'أحمد', 'birth_date': '2020-01-01', 'age': 4, 'phone': '0590000000',
+         'gender': 'ذكر', 'benefit_type': 'كفالة'}
+
+
+def test_update_child_to_taken_id_number_returns_400(client, tenant):
+    client.post('/api/children', json=dict(CHILD, id_number='800000001'), headers=tenant['headers'])
+    other = client.post('/api/children', json=dict(CHILD, id_number='800000002'), headers=tenant['headers']).json
+    response = client.put(f"/api/children/{other['id']}", json={'id_number': '800000001'}, headers=tenant['headers'])
+    assert response.status_code == 400
+    assert response.json['message'] == 'الطفل موجود بالفعل!'
+    # الجلسة سليمة بعد التراجع والطلب التالي ينجح
+    response = client.put(f"/api/children/{other['id']}", json={'name': 'علي'}, headers=tenant['headers'])
+    assert response.status_code == 200 and response.json['name'] == 'علي'
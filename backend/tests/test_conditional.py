@@ -0,0 +1,19 @@
+def test_etag_returns_304_until_the_table_changes(client, tenant, add_resident):
+    add_resident(tenant['id'])
+    first = client.get('/api/residents', headers=tenant['headers'])
+    assert first.status_code == 200 and first.headers['ETag']
+
+    headers = dict(tenant['headers'], **{'If-None-Match': first.headers['ETag']})
+    cached = client.get('/api/residents', headers=headers)
+    assert cached.status_code == 304 and cached.get_data() == b''
+
+    # رابط مختلف له ETag مختلف
+    assert client.get('/api/residents?limit=5', headers=headers).status_code == 200
+
+    response = client.post('/api/residents', json={'husband_name': 'خالد', 'husband_id_number': '400222222'},
+                           headers=tenant['headers'])
+    assert response.status_code == 200
+    changed = client.get('/api/residents', headers=headers)
+    assert changed.status_code == 200 and changed.headers['ETag'] != first.headers['ETag']
+    assert len(changed.json) == 2
+
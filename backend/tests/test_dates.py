@@ -0,0 +1,76 @@
+from datetime import date, datetime
+
+import pytest
+
+from dates import parse_date
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-01-05', date(2024, 1, 5)),
+    ('2024-01-01 00:00:00', date(2024, 1, 1)),
+    ('2024/1/5', date(2024, 1, 5)),
+    # اليوم أولًا، وإذا كان الرقم الثاني أكبر من 12 فالشهر أولًا
+    ('05/03/2024', date(2024, 3, 5)),
+    ('3/25/2024', date(2024, 3, 25)),
+    ('05-03-24', date(2024, 3, 5)),
+    # أرقام Excel التسلسلية رقمًا أو نصًا
+    (45296, date(2024, 1, 5)),
+    (45296.0, date(2024, 1, 5)),
+    ('45296.0', date(2024, 1, 5)),
+    ('٢٠٢٤/٠٤/٠١', date(2024, 4, 1)),
+    (datetime(2024, 2, 10, 13, 30), date(2024, 2, 10)),
+    (date(2024, 2, 10), date(2024, 2, 10)),
+])
+def test_parse_date_accepts_legacy_formats(value, expected):
+    assert parse_date(value) == expected
+
+
+@pytest.mark.parametrize('value', [
+    None, '', 'garbage', '12', True, 12, '2024-02-30', '31/31/2024', '1800-01-01', '2024-13',
+])
+def test_parse_date_rejects_invalid_values(value):
+    assert parse_date(value) is None
+
+
+def test_migration_keeps_unparseable_legacy_dates_as_null(flask_app, client, tenant, add_resident):
+    """جداول Aid وExport بعمود date نصي كما كانت قبل الترحيل، ثم ترقية المخطط عليها"""
+    db, text = flask_app.db, flask_app.db.text
+    resident_id = add_resident(tenant['id'], neighborhood='الشمال')
+    legacy = ['2024-01-05', '05/01/2024', '45297', 'قريبًا', '']
+    with flask_app.app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(text('DROP TABLE aid'))
+            conn.execute(text(
+                'CREATE TABLE aid (id INTEGER PRIMARY KEY, tenant_id INTEGER NOT NULL, resident_id INTEGER NOT NULL, '
+                'aid_type VARCHAR(100) NOT NULL, date VARCHAR(50), updated_at DATETIME, change_seq BIGINT)'))
+            conn.execute(text('CREATE INDEX ix_aid_tenant_date ON aid (tenant_id, date)'))
+            conn.execute(text('DROP TABLE export'))
+            conn.execute(text(
+                'CREATE TABLE export (id INTEGER PRIMARY KEY, tenant_id INTEGER NOT NULL, '
+                'description VARCHAR(200) NOT NULL, amount FLOAT NOT NULL, date VARCHAR(50))'))
+            for i, value in enumerate(legacy):
+                conn.execute(text('INSERT INTO aid (tenant_id, resident_id, aid_type, date) VALUES (:t, :r, :a, :d)'),
+                             {'t': tenant['id'], 'r': resident_id, 'a': f'نوع {i}', 'd': value})
+                conn.execute(text('INSERT INTO export (tenant_id, description, amount, date) VALUES (:t, :n, 1, :d)'),
+                             {'t': tenant['id'], 'n': f'صادر {i}', 'd': value})
+        flask_app.migrate_date_columns()
+        flask_app.ensure_indexes()
+        flask_app.backfill_change_seq()
+
+    expected = ['2024-01-05', '2024-01-05', '2024-01-06', None, None]
+    aids = client.get('/api/aids', headers=tenant['headers']).json
+    assert [aid['date'] for aid in sorted(aids, key=lambda a: a['id'])] == expected
+    exports = client.get('/api/exports', headers=tenant['headers']).json
+    assert [export['date'] for export in sorted(exports, key=lambda e: e['id'])] == expected
+    assert len(client.get('/api/exports?date_from=2024-01-06', headers=tenant['headers']).json) == 1
+
+    # المساعدات بلا تاريخ في الإجمالي فقط، لا في الأيام والأشهر
+    stats = client.get('/api/aids/stats', headers=tenant['headers']).json
+    assert stats['total_aids'] == 5
+    assert stats['daily_counts'] == [{'date': '2024-01-05', 'count': 2}, {'date': '2024-01-06', 'count': 1}]
+    assert stats['monthly_counts'] == [{'month': '2024-01', 'count': 3}]
+
+    # الصف القديم بلا تاريخ يبقى قابلًا للتعديل
+    undated = next(aid for aid in aids if aid['date'] is None)
+    response = client.put(f"/api/aids/{undated['id']}", json={'aid_type': 'غذاء'}, headers=tenant['headers'])
+    assert response.status_code == 200
@@ -0,0 +1,47 @@
+from dedupe import Record, find_duplicates, id_similarity, score_pair
+
+
+def record(id, husband_name=None, husband_id=None, wife_name=None, wife_id=None, phone=None):
+    return Record({'id': id, 'husband_name': husband_name, 'husband_id_number': husband_id,
+                   'wife_name': wife_name, 'wife_id_number': wife_id, 'phone_number': phone})
+
+
+def test_swapped_ids_between_spouses():
+    a = record(1, 'محمد احمد علي', '400111111', 'فاطمة', '800222222')
+    b = record(2, 'محمد احمد علي', '800222222', 'فاطمه', '400111111')
+    score, reasons = score_pair(a, b)
+    assert 'swapped_ids' in reasons
+    assert score >= 0.9
+
+
+def test_same_husband_id_is_not_reported_as_swapped():
+    a = record(1, 'محمد', '400111111')
+    b = record(2, 'محمد', '400111111')
+    assert score_pair(a, b)[1][0] == 'same_id'
+
+
+def test_one_digit_typo_in_id():
+    assert id_similarity('400111111', '400111112') > 0.85
+    score, reasons = score_pair(record(1, 'سعيد خالد', '400111111'), record(2, 'سعيد خالد', '400111112'))
+    assert 'similar_id' in reasons and 'similar_names' in reasons
+
+
+def test_weights_cover_only_available_fields():
+    # رقم هاتف مختلف وحده لا يعطي شيئًا، ولا أوزان بلا حقول مشتركة
+    assert score_pair(record(1, phone='0599000001'), record(2, phone='0599000002'))[0] == 0.0
+    assert score_pair(record(1), record(2)) == (0.0, [])
+
+
+def test_find_duplicates_blocks_and_skips_common_keys():
+    rows = [
+        {'id': 1, 'husband_name': 'محمد احمد علي', 'husband_id_number': '400111111'},
+        {'id': 2, 'husband_name': 'محمد أحمد علي', 'husband_id_number': '400111112'},
+        {'id': 3, 'husband_name': 'خالد سعيد حسن', 'husband_id_number': '900333333'},
+    ]
+    candidates, stats = find_duplicates(rows)
+    assert [(low, high) for low, high, _, _ in candidates] == [(1, 2)]
+    assert stats['residents'] == 3
+
+    crowded = [{'id': i, 'husband_name': 'محمد احمد علي'} for i in range(5)]
+    candidates, stats = find_duplicates(crowded, max_block=3)
+    assert candidates == [] and stats['skipped_blocks'] == 1
@@ -0,0 +1,75 @@
+import io
+
+import pandas as pd
+import pytest
+
+from excel_reader import MissingColumns, SheetError, SheetReader
+
+FIELDS = ['name', 'id_number', 'phone']
+
+
+def csv_file(text, encoding='utf-8', filename='data.csv'):
+    file = io.BytesIO(text.encode(encoding))
+    file.filename = filename
+    return file
+
+
+def read_all(reader):
+    with reader:
+        return [chunk for chunk in reader.chunks()]
+
+
+def test_cp1256_csv_with_arabic_header_aliases():
+    text = 'الاسم,رقم الهوية,عمود آخر\nأحمد,400123456,x\nسعيد,400123457,y\n'
+    reader = SheetReader(csv_file(text, 'cp1256'), FIELDS, required=['name'],
+                         aliases={'الإسم': 'name', 'رقم الهويه': 'id_number'})
+    chunks = read_all(reader)
+    assert reader.columns == ['name', 'id_number']
+    assert chunks[0]['name'].tolist() == ['أحمد', 'سعيد']
+    assert chunks[0]['id_number'].tolist() == ['400123456', '400123457']
+
+
+def test_blank_rows_are_skipped_and_index_matches_file_rows():
+    text = 'name,id_number\na,1\n,\nb,2\n , \nc,3\n'
+    chunks = read_all(SheetReader(csv_file(text), FIELDS, chunk_size=10))
+    assert len(chunks) == 1
+    # الفهرس رقم الصف في الملف ناقص 2 كما في pd.read_excel
+    assert chunks[0].index.tolist() == [0, 2, 4]
+    assert chunks[0]['name'].tolist() == ['a', 'b', 'c']
+
+
+def test_chunk_boundaries():
+    rows = '\n'.join(f'n{i},{i}' for i in range(7))
+    reader = SheetReader(csv_file('name,id_number\n' + rows + '\n'), FIELDS, chunk_size=3)
+    chunks = read_all(reader)
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert chunks[-1].index.tolist() == [6]
+    assert reader.rows_read == 7
+
+
+def test_xlsx_numbers_read_as_text():
+    buffer = io.BytesIO()
+    pd.DataFrame({'name': ['a', None], 'id_number': [400123456.0, 12]}).to_excel(buffer, index=False)
+    buffer.seek(0)
+    buffer.filename = 'data.xlsx'
+    reader = SheetReader(buffer, FIELDS)
+    chunks = read_all(reader)
+    assert reader.total == 2
+    assert chunks[0]['id_number'].tolist() == ['400123456', '12']
+
+
+def test_missing_required_columns():
+    with pytest.raises(MissingColumns) as error:
+        SheetReader(csv_file('name,phone\na,1\n'), FIELDS, required=['name', 'id_number'])
+    assert error.value.missing == ['id_number']
+
+
+@pytest.mark.parametrize('content, filename', [
+    (b'\xd0\xcf\x11\xe0' + b'\0' * 100, 'old.xls'),
+    (b'PK\x03\x04garbage', 'broken.xlsx'),
+])
+def test_unsupported_or_corrupt_files(content, filename):
+    file = io.BytesIO(content)
+    file.filename = filename
+    with pytest.raises(SheetError):
+        SheetReader(file, FIELDS)
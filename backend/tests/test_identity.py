@@ -0,0 +1,56 @@
+import identity
+from identity import Identity, TokenCache
+
+
+def entry(user_id):
+    return Identity({'user_id': user_id, 'tenant_id': 1, 'tv': 0})
+
+
+def test_eviction_keeps_most_recently_used():
+    cache = TokenCache(max_size=2)
+    cache.put('h.p.one', entry(1), expires_at=10 ** 10)
+    cache.put('h.p.two', entry(2), expires_at=10 ** 10)
+    assert cache.get('h.p.one')[0].user_id == 1  # one أصبح الأحدث استخدامًا
+    cache.put('h.p.three', entry(3), expires_at=10 ** 10)
+    assert cache.get('h.p.two') == (None, False)
+    assert cache.get('h.p.one')[0] is not None
+    assert cache.metrics()['evictions'] == 1
+
+
+def test_revalidation_and_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(identity.time, 'time', lambda: now[0])
+    cache = TokenCache(revalidate_after=30)
+    cache.put('h.p.sig', entry(1), expires_at=1100)
+    assert cache.get('h.p.sig')[1] is False
+    now[0] = 1031
+    identity_, stale = cache.get('h.p.sig')
+    assert identity_ is not None and stale is True
+    cache.put('h.p.sig', identity_, expires_at=1100)  # أُعيد التحقق
+    assert cache.get('h.p.sig')[1] is False
+    now[0] = 1100
+    assert cache.get('h.p.sig') == (None, False)
+
+
+def test_signature_collision_compares_full_token():
+    cache = TokenCache()
+    cache.put('a.b.sig', entry(1), expires_at=10 ** 10)
+    assert cache.get('x.y.sig') == (None, False)
+
+
+def test_revoke_user():
+    cache = TokenCache()
+    cache.put('h.p.a', entry(1), expires_at=10 ** 10)
+    cache.put('h.p.b', entry(2), expires_at=10 ** 10)
+    cache.revoke_user(1)
+    assert cache.get('h.p.a') == (None, False)
+    assert cache.get('h.p.b')[0].user_id == 2
+
+
+def test_password_change_revokes_old_token(flask_app, client, tenant):
+    response = client.put('/api/user/update_credentials', json={'password': 'new-secret'}, headers=tenant['headers'])
+    assert response.status_code == 200
+    assert client.get('/api/residents', headers=tenant['headers']).status_code == 401
+    assert client.get('/api/residents', headers={'Authorization': f"Bearer {response.json['token']}"}).status_code == 200
+    login = client.post('/api/login', json={'username': tenant['username'], 'password': 'new-secret'})
+    assert login.json['success'] is True
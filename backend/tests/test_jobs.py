@@ -0,0 +1,88 @@
+import io
+import os
+
+from jobs import WorkerPool
+
+
+def run_next_job(flask_app):
+    """ما يفعله عامل المهام لمهمة واحدة، لكن في نفس العملية"""
+    with flask_app.app.app_context():
+        job_id = flask_app.claim_job()
+    assert job_id is not None
+    flask_app.run_job(job_id)
+    return job_id
+
+
+def test_import_job_streams_upload_in_chunks(flask_app, client, tenant, monkeypatch):
+    monkeypatch.setattr(flask_app, 'JOB_FILE_CHUNK_SIZE', 64)
+    rows = ''.join(f'اسم {i},{400000000 + i}\n' for i in range(20))
+    upload = io.BytesIO(('اسم الزوج,رقم هوية الزوج\n' + rows).encode('utf-8'))
+    response = client.post('/api/residents/import?async=1', data={'file': (upload, 'residents.csv')},
+                           headers=tenant['headers'], content_type='multipart/form-data')
+    assert response.status_code == 202
+    job_id = response.json['id']
+    with flask_app.app.app_context():
+        chunks = flask_app.JobFileChunk.query.filter_by(job_id=job_id, role='upload').count()
+    assert chunks > 1
+
+    assert run_next_job(flask_app) == job_id
+    job = client.get(f'/api/jobs/{job_id}', headers=tenant['headers']).json
+    assert job['status'] == 'succeeded', job
+    assert len(client.get('/api/residents', headers=tenant['headers']).json) == 20
+    with flask_app.app.app_context():
+        # الملف المرفوع يُحذف بعد انتهاء المهمة
+        assert flask_app.JobFileChunk.query.filter_by(job_id=job_id).count() == 0
+
+
+def test_export_job_result_is_streamed_back(flask_app, client, tenant, add_resident, monkeypatch):
+    monkeypatch.setattr(flask_app, 'JOB_FILE_CHUNK_SIZE', 32)
+    for i in range(5):
+        add_resident(tenant['id'], husband_name=f'اسم {i}', husband_id_number=str(400000000 + i))
+    response = client.get('/api/export_residents?async=1&format=csv', headers=tenant['headers'])
+    assert response.status_code == 202
+    job_id = run_next_job(flask_app)
+    assert client.get(f'/api/jobs/{job_id}', headers=tenant['headers']).json['status'] == 'succeeded'
+
+    result = client.get(f'/api/jobs/{job_id}/result', headers=tenant['headers'])
+    assert result.status_code == 200
+    assert 'attachment' in result.headers['Content-Disposition']
+    text = result.get_data().decode('utf-8-sig')
+    assert all(f'اسم {i}' in text for i in range(5))
+
+
+def test_crashed_job_is_marked_failed(flask_app, client, tenant):
+    response = client.post('/api/residents/duplicates/scan?async=1', headers=tenant['headers'])
+    job_id = response.json['id']
+    with flask_app.app.app_context():
+        assert flask_app.claim_job() == job_id
+        flask_app.fail_crashed_job(job_id)
+    job = client.get(f'/api/jobs/{job_id}', headers=tenant['headers']).json
+    assert job['status'] == 'failed' and job['error']
+
+
+def crash_or_return(job_id):
+    if job_id == 1:
+        os._exit(1)
+    return job_id
+
+
+def test_worker_pool_survives_a_dead_process():
+    queue, crashed, finished = [1, 2], [], []
+
+    def claim():
+        return queue.pop(0) if queue else None
+
+    def housekeeping():
+        if len(crashed) + len(finished) == 2:
+            pool.stop()
+
+    pool = WorkerPool(claim, crash_or_return, processes=1, poll_interval=0.05,
+                      housekeeping=housekeeping, housekeeping_interval=0, on_crash=crashed.append)
+    original_reap = pool._reap
+
+    def reap(running):
+        finished.extend(running[f][0] for f in running if f.done() and f.exception() is None)
+        original_reap(running)
+    pool._reap = reap
+    pool.run()
+    assert crashed == [1] and finished == [2]
@@ -0,0 +1,21 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+
+def test_sync_audit_mode_prunes_old_notifications(flask_app, client, tenant):
+    now = datetime.now(pytz.timezone('Asia/Gaza'))
+    with flask_app.app.app_context():
+        flask_app.db.session.add(flask_app.Notification(
+            tenant_id=tenant['id'], user_id=tenant['user_id'], username=tenant['username'],
+            action='إشعار قديم', is_new=True, timestamp=now - timedelta(days=30)))
+        flask_app.db.session.commit()
+    flask_app._last_prune[0] = 0.0
+
+    with flask_app.app.app_context():
+        flask_app.log_action({'tenant_id': tenant['id'], 'user_id': tenant['user_id'],
+                              'username': tenant['username']}, 'إشعار جديد')
+        actions = flask_app.db.session.execute(
+            flask_app.db.select(flask_app.Notification.action)
+            .where(flask_app.Notification.tenant_id == tenant['id'])).scalars().all()
+    assert actions == ['إشعار جديد']
@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from passwords import AttemptLimiter, HasherBusy, PasswordHasher
+
+
+def test_slot_is_held_until_a_timed_out_hash_finishes():
+    hasher = PasswordHasher('pbkdf2:sha256:1000', workers=2, max_pending=1, timeout=0.05)
+    release = threading.Event()
+    try:
+        with pytest.raises(HasherBusy):
+            hasher._run(release.wait)
+        # العملية ما زالت تعمل، فالخانة الوحيدة لم تُحرر
+        with pytest.raises(HasherBusy):
+            hasher.hash('secret')
+    finally:
+        release.set()
+    deadline = time.monotonic() + 5
+    while not hasher._slots.acquire(blocking=False):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    hasher._slots.release()
+    assert hasher.verify(hasher.hash('secret'), 'secret')
+
+
+def test_attempt_limiter_locks_after_max_failures():
+    limiter = AttemptLimiter(max_failures=2, window=60)
+    limiter.failed('a')
+    assert limiter.retry_after('a') == 0
+    limiter.failed('a')
+    assert 0 < limiter.retry_after('a') <= 61
+    limiter.reset('a')
+    assert limiter.retry_after('a') == 0
+
+
+def test_login_rehashes_old_hash(flask_app, client, tenant):
+    with flask_app.app.app_context():
+        user = flask_app.db.session.get(flask_app.User, tenant['user_id'])
+        user.password = generate_password_hash('secret', method='pbkdf2:sha256:1000')
+        flask_app.db.session.commit()
+    assert client.post('/api/login', json={'username': tenant['username'], 'password': 'secret'}).json['success']
+    with flask_app.app.app_context():
+        stored = flask_app.db.session.get(flask_app.User, tenant['user_id']).password
+    assert not flask_app.password_hasher.needs_rehash(stored)
+    assert client.post('/api/login', json={'username': tenant['username'], 'password': 'secret'}).json['success']
+
+
+def test_login_lockout(flask_app, client, tenant):
+    for _ in range(flask_app.app.config['LOGIN_MAX_FAILURES']):
+        response = client.post('/api/login', json={'username': tenant['username'], 'password': 'wrong'})
+        assert response.status_code == 401
+    response = client.post('/api/login', json={'username': tenant['username'], 'password': 'secret'})
+    assert response.status_code == 429 and int(response.headers['Retry-After']) > 0
+    flask_app.login_attempts.reset(tenant['username'])
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def replica_statements(flask_app):
+    """الاستعلامات التي نُفذت على محرك الـ replica أثناء الاختبار"""
+    statements = []
+    with flask_app.app.app_context():
+        engine = flask_app.db.engines['replica']
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', listener)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', listener)
+
+
+def test_reads_stick_to_primary_after_a_write(flask_app, client, tenant, add_resident, monkeypatch,
+                                              replica_statements):
+    add_resident(tenant['id'])
+    before = dict(flask_app.read_routing)
+    assert client.get('/api/residents', headers=tenant['headers']).status_code == 200
+    assert flask_app.read_routing['sticky_primary'] == before.get('sticky_primary', 0) + 1
+    assert replica_statements == []
+
+    monkeypatch.setitem(flask_app.app.config, 'READ_REPLICA_STICKY_SECONDS', 0)
+    response = client.get('/api/residents', headers=tenant['headers'])
+    assert response.status_code == 200 and len(response.json) == 1
+    assert flask_app.read_routing['replica'] == before.get('replica', 0) + 1
+    assert any('FROM resident' in statement for statement in replica_statements)
+
+
+def test_writes_never_use_the_replica(flask_app, client, tenant, monkeypatch, replica_statements):
+    monkeypatch.setitem(flask_app.app.config, 'READ_REPLICA_STICKY_SECONDS', 0)
+    response = client.post('/api/residents', json={'husband_name': 'خالد', 'husband_id_number': '400999999'},
+                           headers=tenant['headers'])
+    assert response.status_code == 200
+    assert replica_statements == []
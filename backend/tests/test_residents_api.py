@@ -0,0 +1,33 @@
+def test_keyset_pages_cover_every_resident_once(flask_app, client, tenant, add_resident):
+    for i in range(5):
+        add_resident(tenant['id'], husband_name=f'اسم {i}', husband_id_number=str(400000000 + i),
+                     num_family_members=i)
+    names, cursor = [], None
+    while True:
+        url = '/api/residents?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url, headers=tenant['headers'])
+        assert response.status_code == 200
+        names += [r['husband_name'] for r in response.json]
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    assert names == sorted(names) and len(names) == 5
+
+
+def test_filters_and_sort(flask_app, client, tenant, add_resident):
+    for i, neighborhood in enumerate(['الشمال', 'الجنوب', 'الشمال']):
+        add_resident(tenant['id'], husband_name=f'اسم {i}', husband_id_number=str(400000000 + i),
+                     num_family_members=i + 3, neighborhood=neighborhood)
+    response = client.get('/api/residents?limit=10&neighborhood=الشمال&sort=num_family_members&order=desc',
+                          headers=tenant['headers'])
+    assert [r['num_family_members'] for r in response.json] == [5, 3]
+    assert response.headers['X-Filtered-Count'] == '2'
+    assert client.get('/api/residents?family_op=>&family_size=x', headers=tenant['headers']).status_code == 400
+    assert client.get('/api/residents?sort=wife_name', headers=tenant['headers']).status_code == 400
+
+
+def test_mistyped_cursor_returns_400(flask_app, client, tenant):
+    for values, sort in ((['a', 'b'], 'husband_name'), ([1, 2], 'husband_name'), (['x'], 'id'), ([True], 'id')):
+        cursor = flask_app.encode_cursor(values)
+        response = client.get(f'/api/residents?limit=10&sort={sort}&cursor={cursor}', headers=tenant['headers'])
+        assert response.status_code == 400
@@ -0,0 +1,37 @@
+BATCH = [
+    {'client_key': 'k1', 'husband_name': 'أول', 'husband_id_number': '400000001'},
+    {'client_key': 'k2', 'husband_name': 'ثاني', 'husband_id_number': '400000002'},
+    {'client_key': 'k3', 'husband_name': 'مكرر في الدفعة', 'husband_id_number': '400000001'},
+    {'husband_name': 'بلا مفتاح'},
+]
+
+
+def post_batch(client, tenant, items):
+    response = client.post('/api/residents/batch', json={'residents': items}, headers=tenant['headers'])
+    assert response.status_code == 200
+    return response.json
+
+
+def test_batch_reports_each_item(client, tenant):
+    body = post_batch(client, tenant, BATCH)
+    assert [r['status'] for r in body['results']] == ['created', 'created', 'duplicate_in_batch', 'invalid']
+    assert (body['created'], body['already_synced'], body['rejected']) == (2, 0, 2)
+
+
+def test_resending_a_batch_does_not_duplicate(client, tenant):
+    first = post_batch(client, tenant, BATCH[:2])
+    again = post_batch(client, tenant, BATCH[:2])
+    assert [r['status'] for r in again['results']] == ['already_synced', 'already_synced']
+    assert [r['id'] for r in again['results']] == [r['id'] for r in first['results']]
+    assert len(client.get('/api/residents', headers=tenant['headers']).json) == 2
+
+    # مفتاح جديد برقم هوية موجود يُرفض كمكرر ويشير إلى السجل الموجود
+    body = post_batch(client, tenant, [{'client_key': 'k9', 'husband_id_number': '400000002'}])
+    assert body['results'][0]['status'] == 'duplicate'
+    assert body['results'][0]['id'] == first['results'][1]['id']
+
+
+def test_batch_validation(client, tenant):
+    assert client.post('/api/residents/batch', json={'residents': []}, headers=tenant['headers']).status_code == 400
+    body = post_batch(client, tenant, [{'client_key': 'k1', 'num_family_members': 'كثير'}])
+    assert body['results'][0]['status'] == 'invalid'
@@ -0,0 +1,26 @@
+def test_check_while_typing(client, tenant, add_resident):
+    resident_id = add_resident(tenant['id'], husband_id_number='400000001', phone_number='0599000001')
+    response = client.get('/api/residents/check?husband_id_number=400000001&phone_number=',
+                          headers=tenant['headers'])
+    assert response.json == {'exists': True, 'matches': [
+        {'field': 'husband_id_number', 'value': '400000001', 'resident_id': resident_id}]}
+    # الحقول الفارغة لا تطابق المستفيدين الذين قيمتهم فارغة
+    assert client.get('/api/residents/check?wife_id_number=', headers=tenant['headers']).json['exists'] is False
+
+
+def test_bulk_precheck(client, tenant, add_resident):
+    first = add_resident(tenant['id'], husband_id_number='400000001', wife_id_number='800000001')
+    second = add_resident(tenant['id'], husband_id_number='400000002', phone_number='0599000002')
+    response = client.post('/api/residents/check', headers=tenant['headers'], json={
+        'ids': ['400000001', '800000001', '400000009', ' 400000002 '], 'phones': ['0599000002']})
+    body = response.json
+    assert body['count'] == 4
+    assert body['existing']['800000001'] == [{'field': 'wife_id_number', 'resident_id': first}]
+    assert body['existing']['0599000002'] == [{'field': 'phone_number', 'resident_id': second}]
+    assert '400000009' not in body['existing']
+
+
+def test_bulk_precheck_validation(flask_app, client, tenant):
+    assert client.post('/api/residents/check', json={'ids': '400000001'}, headers=tenant['headers']).status_code == 400
+    too_many = ['1'] * (flask_app.RESIDENT_CHECK_MAX + 1)
+    assert client.post('/api/residents/check', json={'ids': too_many}, headers=tenant['headers']).status_code == 400
@@ -0,0 +1,35 @@
+def search(client, tenant, query, **params):
+    params = ''.join(f'&{key}={value}' for key, value in params.items())
+    return client.get(f'/api/search?q={query}{params}', headers=tenant['headers'])
+
+
+def test_search_matches_spelling_variants(client, tenant, add_resident):
+    first = add_resident(tenant['id'], husband_name='أحمد محمد', husband_id_number='400000001')
+    add_resident(tenant['id'], husband_name='محمود سعيد', husband_id_number='400000002')
+    response = search(client, tenant, 'احمد')
+    assert response.status_code == 200
+    assert [r['id'] for r in response.json] == [first]
+    assert response.json[0]['score'] > 0
+    # جزء من رقم الهوية
+    assert [r['id'] for r in search(client, tenant, '00001').json] == [first]
+
+
+def test_search_sees_new_rows_and_pages(client, tenant, add_resident):
+    for i in range(3):
+        add_resident(tenant['id'], husband_name=f'فاطمة {i}', husband_id_number=str(400000010 + i))
+    assert len(search(client, tenant, 'فاطمه').json) == 3
+    client.post('/api/residents', json={'husband_name': 'فاطمة الجديدة', 'husband_id_number': '400000020'},
+                headers=tenant['headers'])
+    first = search(client, tenant, 'فاطمه', limit=3)
+    assert len(first.json) == 3 and first.headers['X-Filtered-Count'] == '4'
+    rest = search(client, tenant, 'فاطمه', limit=3, cursor=first.headers['X-Next-Cursor'])
+    assert len(rest.json) == 1 and 'X-Next-Cursor' not in rest.headers
+
+
+def test_search_children_and_validation(client, tenant):
+    client.post('/api/children', headers=tenant['headers'], json={
+        'name': 'مصطفى', 'id_number': '800000001', 'birth_date': '2020-01-01', 'age': 4,
+        'phone': '0590000000', 'gender': 'ذكر', 'benefit_type': 'كفالة'})
+    assert [c['name'] for c in search(client, tenant, 'مصطفي', type='children').json] == ['مصطفى']
+    assert search(client, tenant, 'ا').status_code == 400
+    assert search(client, tenant, 'احمد', type='aids').status_code == 400
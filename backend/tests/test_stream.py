@@ -0,0 +1,37 @@
+def query_token(client, tenant):
+    return client.post('/api/query_token', headers=tenant['headers']).json['token']
+
+
+def test_stream_requires_query_token(client, tenant):
+    login_token = tenant['headers']['Authorization'].replace('Bearer ', '')
+    assert client.get(f'/api/notifications/stream?token={login_token}').status_code == 401
+    # توكن الرابط لا يصلح لباقي المسارات
+    token = query_token(client, tenant)
+    assert client.get('/api/residents', headers={'Authorization': f'Bearer {token}'}).status_code == 401
+
+
+def test_stream_replays_missed_notifications(flask_app, client, tenant, monkeypatch):
+    monkeypatch.setitem(flask_app.app.config, 'SSE_MAX_DURATION', 0)
+    with flask_app.app.app_context():
+        for action in ('أول', 'ثاني'):
+            flask_app.log_action({'tenant_id': tenant['id'], 'user_id': tenant['user_id'],
+                                  'username': tenant['username']}, action)
+        first = flask_app.Notification.query.filter_by(tenant_id=tenant['id'], action='أول').one().id
+
+    response = client.get(f'/api/notifications/stream?token={query_token(client, tenant)}&last_id={first}')
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    assert body.startswith('retry: 3000') and 'ثاني' in body and 'أول' not in body
+
+
+def test_stream_returns_503_when_slots_are_full(flask_app, client, tenant):
+    token = query_token(client, tenant)
+    taken = 0
+    while flask_app.stream_slots.acquire(blocking=False):
+        taken += 1
+    try:
+        response = client.get(f'/api/notifications/stream?token={token}')
+        assert response.status_code == 503 and 'Retry-After' in response.headers
+    finally:
+        for _ in range(taken):
+            flask_app.stream_slots.release()
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+
+def sync(client, tenant, since=None):
+    response = client.get('/api/sync' + (f'?since={since}' if since else ''), headers=tenant['headers'])
+    assert response.status_code == 200
+    return response.json
+
+
+def test_sync_returns_changes_and_deletions_since_cursor(client, tenant, add_resident):
+    first = add_resident(tenant['id'], husband_name='أول')
+    second = add_resident(tenant['id'], husband_name='ثاني', husband_id_number='400222222')
+    page = sync(client, tenant)
+    assert [r['id'] for r in page['changes']['residents']] == [first, second]
+
+    client.put(f'/api/residents/{first}', json={'husband_name': 'أول معدل'}, headers=tenant['headers'])
+    client.delete(f'/api/residents/{second}', headers=tenant['headers'])
+    page = sync(client, tenant, page['next'])
+    assert [r['husband_name'] for r in page['changes']['residents']] == ['أول معدل']
+    assert page['deleted']['residents'] == [second]
+    assert sync(client, tenant, page['next'])['changes']['residents'] == []
+
+
+def test_late_commit_is_not_skipped(flask_app, client, tenant, add_resident):
+    add_resident(tenant['id'])
+    cursor = sync(client, tenant)['next']
+    # معاملة أخذت وقت updated_at قبل المزامنة السابقة ولم تُثبَّت إلا بعدها
+    late = add_resident(tenant['id'], husband_id_number='400333333', updated_at=datetime(2000, 1, 1))
+    page = sync(client, tenant, cursor)
+    assert [r['id'] for r in page['changes']['residents']] == [late]
+
+
+def test_sync_pages_and_rejects_bad_cursor(flask_app, client, tenant, add_resident):
+    ids = [add_resident(tenant['id'], husband_id_number=str(400000000 + i)) for i in range(3)]
+    seen, since = [], None
+    while True:
+        response = client.get('/api/sync?limit=2' + (f'&since={since}' if since else ''), headers=tenant['headers'])
+        page = response.json
+        seen += [r['id'] for r in page['changes']['residents']]
+        since = page['next']
+        if not page['has_more']:
+            break
+    assert seen == ids
+    bad = flask_app.encode_cursor([['2024-01-01T00:00:00', 1]] * 5)
+    assert client.get(f'/api/sync?since={bad}', headers=tenant['headers']).status_code == 400
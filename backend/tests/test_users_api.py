@@ -0,0 +1,43 @@
+def add_user(flask_app, tenant_id, username, role='admin'):
+    with flask_app.app.app_context():
+        user = flask_app.User(username=username, role=role, tenant_id=tenant_id)
+        user.set_password('secret')
+        flask_app.db.session.add(user)
+        flask_app.db.session.commit()
+        return {'Authorization': f'Bearer {flask_app.generate_token(user)}'}
+
+
+def test_tenant_admin_sees_only_own_tenant(flask_app, client, tenant):
+    add_user(flask_app, tenant['id'], f"employee-{tenant['id']}", role='employee')
+    with flask_app.app.app_context():
+        other = flask_app.Tenant(name='جهة أخرى', slug=f"other-{tenant['id']}")
+        flask_app.db.session.add(other)
+        flask_app.db.session.commit()
+        other_id = other.id
+    add_user(flask_app, other_id, f"other-admin-{other_id}")
+
+    users = client.get('/api/users', headers=tenant['headers']).json
+    assert {u['tenant_id'] for u in users} == {tenant['id']} and len(users) == 2
+    assert client.get(f'/api/users?tenant_id={other_id}', headers=tenant['headers']).json == []
+
+    platform = add_user(flask_app, tenant['id'], f"platform-{tenant['id']}", role='user')
+    users = client.get(f'/api/users?tenant_id={other_id}', headers=platform).json
+    assert [u['username'] for u in users] == [f"other-admin-{other_id}"]
+
+
+def test_users_paging(flask_app, client, tenant):
+    for i in range(4):
+        add_user(flask_app, tenant['id'], f"paged-{tenant['id']}-{i}", role='employee')
+    seen, cursor = [], None
+    while True:
+        response = client.get('/api/users?limit=2' + (f'&cursor={cursor}' if cursor else ''),
+                              headers=tenant['headers'])
+        assert response.status_code == 200
+        if cursor is None:
+            assert response.headers['X-Filtered-Count'] == '5'
+        seen += [u['id'] for u in response.json]
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    assert seen == sorted(seen) and len(seen) == 5
+    assert client.get('/api/users?limit=2&cursor=abc', headers=tenant['headers']).status_code == 400
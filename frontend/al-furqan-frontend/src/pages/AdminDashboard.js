@@ -3,6 +3,7 @@ import { toast, Toaster } from "react-hot-toast";
 
 const AdminDashboard = () => {
   const [users, setUsers] = useState([]);
+  const [tenantCounts, setTenantCounts] = useState({});
   const [form, setForm] = useState({ username: "", password: "", tenant: "" });
   const authToken = localStorage.getItem("token");
   const userRole = localStorage.getItem("role");
@@ -50,6 +51,12 @@ const AdminDashboard = () => {
       })
       .then(setUsers)
       .catch((err) => addNotification(err.message, false));
+
+    // عدد مستخدمي كل جهة من تجميع على الخادم بدل عدّ القائمة كاملة
+    fetchWithAuth("https://final-project-al-furqan-rj1r.onrender.com/api/users/tenant_counts")
+      .then((res) => (res.ok ? res.json() : []))
+      .then((rows) => setTenantCounts(Object.fromEntries(rows.map((t) => [t.tenant_id, t.count]))))
+      .catch(() => {});
   };
 
   useEffect(() => {
@@ -137,6 +144,7 @@ const AdminDashboard = () => {
                 <th style={styles.th}>#</th>
                 <th style={styles.th}>اسم المستخدم</th>
                 <th style={styles.th}>الجهة</th>
+                <th style={styles.th}>مستخدمو الجهة</th>
                 <th style={styles.th}>الدور</th>
                 <th style={styles.th}>إجراء</th>
               </tr>
@@ -149,6 +157,7 @@ const AdminDashboard = () => {
                   <td style={styles.td}>{index + 1}</td>
                   <td style={styles.td}>{u.username}</td>
                   <td style={styles.td}>{u.tenant || "-"}</td>
+                  <td style={styles.td}>{tenantCounts[u.tenant_id] ?? "-"}</td>
                   <td style={styles.td}>{u.role || "-"}</td>
                   <td style={styles.td}>
                     <button
@@ -2,19 +2,40 @@
 import { getAllOfflineResidents, clearOfflineResidents } from './utils/idb';
 import axios from 'axios';
 
+const BATCH_SIZE = 500;
+
+// مفتاح ثابت لكل سجل: إعادة الإرسال بعد انقطاع لا تنشئ المستفيد مرتين
+async function clientKey(resident) {
+  if (resident.client_key) return resident.client_key;
+  const data = new TextEncoder().encode(JSON.stringify(resident));
+  const digest = await crypto.subtle.digest('SHA-256', data);
+  return Array.from(new Uint8Array(digest).slice(0, 16))
+    .map((b) => b.toString(16).padStart(2, '0'))
+    .join('');
+}
+
 export async function syncOfflineResidents() {
   const token = localStorage.getItem('token');
   const residents = await getAllOfflineResidents();
+  const payload = await Promise.all(
+    residents.map(async (resident) => ({ ...resident, client_key: await clientKey(resident) }))
+  );
 
-  for (const resident of residents) {
+  for (let i = 0; i < payload.length; i += BATCH_SIZE) {
     try {
-      await axios.post('https://al-furqan-project-uqs4.onrender.com/api/residents', resident, {
-        headers: {
-          Authorization: `Bearer ${token}`,
-        },
-      });
+      await axios.post(
+        'https://al-furqan-project-uqs4.onrender.com/api/residents/batch',
+        { residents: payload.slice(i, i + BATCH_SIZE) },
+        {
+          headers: {
+            Authorization: `Bearer ${token}`,
+          },
+        }
+      );
     } catch (error) {
-      console.error('فشل في إرسال المستفيد من IndexedDB:', error);
+      // تبقى السجلات محفوظة محليًا وتُعاد في المزامنة التالية
+      console.error('فشل في إرسال المستفيدين من IndexedDB:', error);
+      return;
     }
   }
 